@@ -0,0 +1,68 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+from main import DataBase
+
+
+# 生成模拟的共享过滤器库: 大量重复的 frame contains "..." 片段
+def build_db(category_count: int, filter_count: int) -> DataBase:
+    rng = random.Random(0)
+    keywords = [f"MODULE_{i}_EVENT" for i in range(200)]
+    db = DataBase()
+    for c in range(category_count):
+        cat = db.add_category(f"类别{c}")
+        for i in range(filter_count):
+            parts = [f'frame contains "{rng.choice(keywords)}"' for _ in range(rng.randint(1, 4))]
+            db.add_filter(cat, f"过滤器{i}", "||".join(parts))
+    return db
+
+
+def best_time(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    category_count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    filter_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    db = build_db(category_count, filter_count)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "FilterHelper.json")
+        compact_path = os.path.join(tmp, "FilterHelper.fhpk")
+        db.save_json(json_path, compact=False)
+        db.save_json(compact_path, compact=True)
+
+        loader = DataBase()
+        loader.print_tree = lambda: None
+        json_time = best_time(lambda: loader.load_json(json_path))
+        compact_time = best_time(lambda: loader.load_json(compact_path))
+        cid = db.categories[-1].cid
+        loader.json_path = json_path
+        json_one_time = best_time(lambda: loader.read_category(cid))
+        loader.json_path = compact_path
+        compact_one_time = best_time(lambda: loader.read_category(cid))
+
+        json_size = os.path.getsize(json_path)
+        compact_size = os.path.getsize(compact_path)
+        print(f"类别数: {category_count}, 每类过滤器数: {filter_count}")
+        print(f"JSON:     {json_size:>10} 字节  全部加载 {json_time * 1000:8.2f} ms"
+              f"  单个类别 {json_one_time * 1000:8.2f} ms")
+        print(f"紧凑格式: {compact_size:>10} 字节  全部加载 {compact_time * 1000:8.2f} ms"
+              f"  单个类别 {compact_one_time * 1000:8.2f} ms")
+        print(f"紧凑格式大小为 JSON 的 {compact_size / json_size:.1%}, "
+              f"全部加载耗时为 JSON 的 {compact_time / json_time:.0%}")
+        # 本地磁盘上解压和解码比直接解析 JSON 更慢, 紧凑格式的收益完全来自文件体积,
+        # 只有在慢速网络共享等 I/O 受限的场景下才能体现
+        if compact_time > json_time:
+            print("注意: 本地读取时紧凑格式全部加载比 JSON 慢, 其收益仅来自更小的文件体积(适用于慢速网络共享)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,270 @@
 from tkinter import *
 from tkinter.simpledialog import askstring
 from tkinter.messagebox import askyesno, showwarning
+from tkinter.filedialog import asksaveasfilename
 import tkinter.font as tkFont
 
 import os
+import re
 import json
+import time
+import zlib
+import struct
 import random
 import string
-from typing import List
+import bisect
+import functools
+from collections import deque
+from typing import Dict, Iterable, List
+
+
+# =========================== 性能统计 =========================== #
+class TimingStat:
+    # 保留最近的采样用于计算分位数, 计数/总耗时/最大值为全量统计
+    MAX_SAMPLES = 2048
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=self.MAX_SAMPLES)
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.samples.append(elapsed)
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class Profiler:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.stats: Dict[str, TimingStat] = {}
+
+    # 装饰器: 统计被装饰函数的调用次数和耗时, 未启用时只多一次属性判断
+    def timed(self, name: str = None):
+        def decorator(func):
+            key = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(key, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, elapsed: float):
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self.stats[name] = TimingStat()
+        stat.add(elapsed)
+
+    def reset(self):
+        self.stats = {}
+
+    def summary(self) -> Dict[str, dict]:
+        return {name: stat.to_dict() for name, stat in sorted(self.stats.items())}
+
+    def dump_json(self, json_path: str):
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+# 设置环境变量 FILTERHELPER_PROFILE=1 可在启动时开启统计, 也可在统计窗口中切换
+profiler = Profiler(os.environ.get("FILTERHELPER_PROFILE") == "1")
+
+
+# =========================== 紧凑存储格式 =========================== #
+# 文件布局: MAGIC | 版本(1字节) | 头部长度(uint32, 小端) | 头部JSON | 数据块...
+# 头部记录压缩算法、片段表块以及每个类别块的 [cid, 名称, 偏移, 长度], 偏移相对于数据区起始位置。
+# 内容按 || 和 && 切分成片段, 片段在全文件范围内去重后存入片段表, 拼接片段即可无损还原。
+# 类别块为压缩后的 [[fid, 名称, [片段下标...]], ...], fid 和名称直接内联, 读取单个类别时只需解压片段表和该类别块。
+COMPACT_MAGIC = b"FHPK"
+COMPACT_VERSION = 2
+_COMPACT_PREFIX = struct.Struct('<BI')
+_CONTENT_SPLIT_RE = re.compile(r'(\s*(?:\|\||&&)\s*)')
+
+
+def _zlib_codec():
+    return lambda b: zlib.compress(b, 9), zlib.decompress
+
+
+def _bz2_codec():
+    import bz2
+    return bz2.compress, bz2.decompress
+
+
+def _lzma_codec():
+    import lzma
+    return lzma.compress, lzma.decompress
+
+
+# bz2/lzma 在部分 Python 构建中不可用, 因此按需导入
+COMPACT_CODECS = {
+    "zlib": _zlib_codec,
+    "bz2": _bz2_codec,
+    "lzma": _lzma_codec,
+}
+
+
+def _get_codec(codec: str):
+    if codec not in COMPACT_CODECS:
+        raise ValueError(f"不支持的压缩算法: {codec}")
+    try:
+        return COMPACT_CODECS[codec]()
+    except ImportError:
+        raise ValueError(f"当前 Python 不支持压缩算法: {codec}")
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        i = self._index.get(value)
+        if i is None:
+            i = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return i
+
+
+def _pack_block(obj, compress) -> bytes:
+    return compress(json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def _unpack_block(f, data_start: int, span: list, decompress):
+    offset, length = span
+    f.seek(data_start + offset)
+    raw = f.read(length)
+    if len(raw) != length:
+        raise ValueError("紧凑格式文件已损坏")
+    try:
+        return json.loads(decompress(raw).decode('utf-8'))
+    except Exception as e:
+        raise ValueError("紧凑格式文件已损坏") from e
+
+
+def _is_span(value) -> bool:
+    return (isinstance(value, list) and len(value) == 2
+            and all(isinstance(v, int) and v >= 0 for v in value))
+
+
+def is_compact_file(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(len(COMPACT_MAGIC)) == COMPACT_MAGIC
+
+
+def dump_compact(data: list, f, codec: str = "zlib"):
+    # data 与 JSON 格式相同: [[cid, 名称, [[fid, 名称, 内容], ...]], ...]
+    compress = _get_codec(codec)[0]
+    table = _StringTable()
+    cat_blocks = []
+    for cid, cname, filters in data:
+        rows = []
+        for fid, fname, fcontent in filters:
+            rows.append([fid, fname, [table.add(p) for p in _CONTENT_SPLIT_RE.split(fcontent) if p]])
+        cat_blocks.append((cid, cname, _pack_block(rows, compress)))
+
+    blocks = [_pack_block(table.strings, compress)]
+    header = {"codec": codec, "fragments": [0, len(blocks[0])], "categories": []}
+    offset = len(blocks[0])
+    for cid, cname, block in cat_blocks:
+        header["categories"].append([cid, cname, offset, len(block)])
+        blocks.append(block)
+        offset += len(block)
+
+    header_bytes = json.dumps(header, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    f.write(COMPACT_MAGIC + _COMPACT_PREFIX.pack(COMPACT_VERSION, len(header_bytes)) + header_bytes)
+    for block in blocks:
+        f.write(block)
+
+
+def _read_compact_header(f):
+    if f.read(len(COMPACT_MAGIC)) != COMPACT_MAGIC:
+        raise ValueError("不是紧凑格式文件")
+    prefix = f.read(_COMPACT_PREFIX.size)
+    if len(prefix) != _COMPACT_PREFIX.size:
+        raise ValueError("紧凑格式文件已损坏")
+    version, header_len = _COMPACT_PREFIX.unpack(prefix)
+    if version != COMPACT_VERSION:
+        raise ValueError(f"不支持的紧凑格式版本: {version}")
+    header_bytes = f.read(header_len)
+    if len(header_bytes) != header_len:
+        raise ValueError("紧凑格式文件已损坏")
+    try:
+        header = json.loads(header_bytes.decode('utf-8'))
+    except ValueError as e:
+        raise ValueError("紧凑格式文件已损坏") from e
+    if (not isinstance(header, dict) or not isinstance(header.get("codec"), str)
+            or not _is_span(header.get("fragments")) or not isinstance(header.get("categories"), list)):
+        raise ValueError("紧凑格式文件已损坏")
+    for entry in header["categories"]:
+        if (not isinstance(entry, list) or len(entry) != 4 or not isinstance(entry[0], str)
+                or not isinstance(entry[1], str) or not _is_span(entry[2:])):
+            raise ValueError("紧凑格式文件已损坏")
+    return header, f.tell()
+
+
+def _load_fragments(f, header: dict, data_start: int, decompress) -> List[str]:
+    fragments = _unpack_block(f, data_start, header["fragments"], decompress)
+    if not isinstance(fragments, list) or not all(isinstance(p, str) for p in fragments):
+        raise ValueError("紧凑格式文件已损坏")
+    return fragments
+
+
+def _decode_category(f, data_start: int, entry: list, fragments: List[str], decompress) -> list:
+    cid, cname, offset, length = entry
+    rows = _unpack_block(f, data_start, [offset, length], decompress)
+    if not isinstance(rows, list):
+        raise ValueError("紧凑格式文件已损坏")
+    # 数据块自带 zlib/bz2/lzma 校验, 这里只需处理结构不符的情况
+    try:
+        filters = [[fid, fname, "".join(map(fragments.__getitem__, pieces))] for fid, fname, pieces in rows]
+    except (TypeError, ValueError, IndexError) as e:
+        raise ValueError("紧凑格式文件已损坏") from e
+    return [cid, cname, filters]
+
+
+def load_compact(f) -> list:
+    header, data_start = _read_compact_header(f)
+    decompress = _get_codec(header["codec"])[1]
+    fragments = _load_fragments(f, header, data_start, decompress)
+    return [_decode_category(f, data_start, entry, fragments, decompress) for entry in header["categories"]]
+
+
+# 只读取片段表和指定类别的数据块, 不解压其他类别; 类别不存在时返回 None
+def load_compact_category(f, cid: str):
+    header, data_start = _read_compact_header(f)
+    decompress = _get_codec(header["codec"])[1]
+    for entry in header["categories"]:
+        if entry[0] == cid:
+            fragments = _load_fragments(f, header, data_start, decompress)
+            return _decode_category(f, data_start, entry, fragments, decompress)
+    return None
 
 
 # =========================== 数据库类 =========================== #
@@ -23,20 +280,62 @@ class CategoryData:
         self.cid = cid
         self.name = name
         self.filters = filters
+        # 组合全部过滤器的表达式缓存, 键为模式; 子集组合不缓存
+        self._expr_cache: Dict[tuple, str] = {}
 
     def add_filter(self, filter_data: FilterData):
         self.filters.append(filter_data)
+        self.invalidate_expression()
+
+    # 过滤器内容变化后必须调用, 使缓存的组合表达式失效
+    def invalidate_expression(self):
+        self._expr_cache.clear()
+
+    # 将类别中的过滤器组合为一个表达式, mode 为 "or" 或 "and", fids 为 None 时组合全部过滤器
+    def combined_expression(self, mode: str = "or", fids: Iterable[str] = None) -> str:
+        if mode != "or" and mode != "and":
+            raise ValueError(f"不支持的操作: {mode}")
+        if fids is None:
+            expr = self._expr_cache.get(mode)
+            if expr is None:
+                expr = self._expr_cache[mode] = self.__combine(mode, self.filters)
+            return expr
+        if isinstance(fids, str):
+            raise ValueError("fids 必须是 fid 的集合, 而不是单个字符串")
+        wanted = set(fids)
+        missing = wanted - {f.fid for f in self.filters}
+        if missing:
+            raise ValueError(f"过滤器不存在: {', '.join(sorted(missing))}")
+        return self.__combine(mode, [f for f in self.filters if f.fid in wanted])
+
+    @staticmethod
+    def __combine(mode: str, filters: List[FilterData]) -> str:
+        parts = []
+        for f in filters:
+            if not f.content or f.content.isspace():
+                continue  # 空白内容不处理
+            parts.append(f.content.replace('\r\n', '').replace('\n', '').replace('\r', ''))
+        if mode == "or" or len(parts) == 1:
+            return " || ".join(parts)
+        return " && ".join(f"({part})" for part in parts)
 
 
 class DataBase:
     def __init__(self, json_path: str = None):
         self.json_path = json_path
+        # 文件是否为紧凑格式, 加载时自动识别, 保存时默认沿用
+        self.compact = False
         self.categories: List[CategoryData] = []
         # 用于记录已使用的 ID, 避免重复
         self._used_ids: set = set()
+        # 按名称排序的 (小写名称, cid) 索引, 用于类别名称前缀搜索
+        self._name_index: List[tuple] = []
+        # cid -> 类别在 categories 中的位置, 插入/删除后置为 None, 搜索时按需重建
+        self._positions: Dict[str, int] = None
         if json_path is not None:
             self.load_json(json_path)
 
+    @profiler.timed()
     def load_json(self, json_path: str = None):
         if json_path is not None:
             self.json_path = json_path
@@ -44,39 +343,71 @@ class DataBase:
             raise ValueError("JSON 文件路径不能为空")
         if not os.path.exists(self.json_path):
             raise FileNotFoundError(f"JSON 文件不存在: {self.json_path}")
-        with open(self.json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        self.compact = is_compact_file(self.json_path)
+        if self.compact:
+            with open(self.json_path, 'rb') as f:
+                data = load_compact(f)
+        else:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         if not isinstance(data, list):
             raise ValueError("JSON 必须是一个列表")
-        self.categories = []
-        for cat in data:
-            if not isinstance(cat, list) or len(cat) != 3:
-                raise ValueError("JSON 列表元素必须是一个长度为 3 的列表")
-            cid, cname, filters = cat
-            if not isinstance(cid, str) or not isinstance(cname, str) or not isinstance(filters, list):
-                raise ValueError("JSON 列表元素必须是字符串和列表")
-            if not all(isinstance(f, list) and len(f) == 3 for f in filters):
-                raise ValueError("JSON 列表元素的 filters 元素必须是一个长度为 3 的列表")
-            category_data = CategoryData(cid, cname, [])
-            for f in filters:
-                fid, fname, fcontent = f
-                if not isinstance(fid, str) or not isinstance(fname, str) or not isinstance(fcontent, str):
-                    raise ValueError("JSON 列表元素的 filters 元素必须是字符串")
-                filter_data = FilterData(fid, fname, fcontent)
-                category_data.add_filter(filter_data)
-            self.categories.append(category_data)
+        self.categories = [self._parse_category(cat) for cat in data]
 
         self._used_ids = set()
         for cat in self.categories:
             self._used_ids.add(cat.cid)
             for f in cat.filters:
                 self._used_ids.add(f.fid)
+        self._rebuild_name_index()
 
         self.print_tree()
 
-    def save_json(self, json_path: str = None):
+    # 只读取文件中的单个类别, 不修改当前数据; 紧凑格式直接定位到该类别的数据块
+    @profiler.timed()
+    def read_category(self, cid: str):
+        if self.json_path is None:
+            raise ValueError("JSON 文件路径不能为空")
+        if not os.path.exists(self.json_path):
+            raise FileNotFoundError(f"JSON 文件不存在: {self.json_path}")
+        if is_compact_file(self.json_path):
+            with open(self.json_path, 'rb') as f:
+                cat = load_compact_category(f, cid)
+            return None if cat is None else self._parse_category(cat)
+        with open(self.json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError("JSON 必须是一个列表")
+        for cat in data:
+            category_data = self._parse_category(cat)
+            if category_data.cid == cid:
+                return category_data
+        return None
+
+    @staticmethod
+    def _parse_category(cat) -> CategoryData:
+        if not isinstance(cat, list) or len(cat) != 3:
+            raise ValueError("JSON 列表元素必须是一个长度为 3 的列表")
+        cid, cname, filters = cat
+        if not isinstance(cid, str) or not isinstance(cname, str) or not isinstance(filters, list):
+            raise ValueError("JSON 列表元素必须是字符串和列表")
+        if not all(isinstance(f, list) and len(f) == 3 for f in filters):
+            raise ValueError("JSON 列表元素的 filters 元素必须是一个长度为 3 的列表")
+        category_data = CategoryData(cid, cname, [])
+        for f in filters:
+            fid, fname, fcontent = f
+            if not isinstance(fid, str) or not isinstance(fname, str) or not isinstance(fcontent, str):
+                raise ValueError("JSON 列表元素的 filters 元素必须是字符串")
+            filter_data = FilterData(fid, fname, fcontent)
+            category_data.add_filter(filter_data)
+        return category_data
+
+    @profiler.timed()
+    def save_json(self, json_path: str = None, compact: bool = None):
         if json_path is not None:
             self.json_path = json_path
+        if compact is not None:
+            self.compact = compact
         if self.json_path is None:
             raise ValueError("JSON 文件路径不能为空")
         data = []
@@ -85,8 +416,12 @@ class DataBase:
             for f in cat.filters:
                 filters.append([f.fid, f.name, f.content])
             data.append([cat.cid, cat.name, filters])
-        with open(self.json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if self.compact:
+            with open(self.json_path, 'wb') as f:
+                dump_compact(data, f)
+        else:
+            with open(self.json_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
 
     def generate_unique_id(self, length: int = 8) -> str:
         chars = string.ascii_lowercase + string.digits
@@ -96,6 +431,7 @@ class DataBase:
                 self._used_ids.add(new_id)
                 return new_id
 
+    @profiler.timed()
     def add_category(self, category_name: str) -> CategoryData:
         if not category_name:
             raise ValueError("类别名称不能为空")
@@ -103,8 +439,12 @@ class DataBase:
         category_data = CategoryData(cid, category_name, [])
         self.categories.append(category_data)
         self._used_ids.add(cid)
+        self._index_add(category_data)
+        if self._positions is not None:
+            self._positions[cid] = len(self.categories) - 1
         return category_data
 
+    @profiler.timed()
     def insert_category(self, category_name: str, next_category: CategoryData) -> CategoryData:
         if not category_name:
             raise ValueError("类别名称不能为空")
@@ -116,23 +456,32 @@ class DataBase:
             if cat.cid == next_category.cid:
                 self.categories.insert(i, category_data)
                 self._used_ids.add(cid)
+                self._index_add(category_data)
+                self._positions = None
                 return category_data
 
+    @profiler.timed()
     def remove_category(self, category: CategoryData) -> bool:
         for i, cat in enumerate(self.categories):
             if cat.cid == category.cid:
                 self.categories.pop(i)
                 self._used_ids.discard(category.cid)
+                self._index_remove(cat)
+                self._positions = None
                 return True
         return False
 
+    @profiler.timed()
     def rename_category(self, category: CategoryData, new_name: str) -> bool:
         for cat in self.categories:
             if cat.cid == category.cid:
+                self._index_remove(cat)
                 cat.name = new_name
+                self._index_add(cat)
                 return True
         return False
 
+    @profiler.timed()
     def add_filter(self, category: CategoryData, filter_name: str, content: str) -> FilterData:
         for cat in self.categories:
             if cat.cid == category.cid:
@@ -143,6 +492,7 @@ class DataBase:
                 return filter_data
         raise ValueError(f"类别不存在: {category.cid}")
 
+    @profiler.timed()
     def insert_filter(self, category: CategoryData, filter_name: str, filter: FilterData) -> FilterData:
         for cat in self.categories:
             if cat.cid == category.cid:
@@ -151,19 +501,23 @@ class DataBase:
                         fid = self.generate_unique_id(8)
                         filter_data = FilterData(fid, filter_name, "")
                         cat.filters.insert(i, filter_data)
+                        cat.invalidate_expression()
                         self._used_ids.add(fid)
                         return filter_data
 
+    @profiler.timed()
     def remove_filter(self, category: CategoryData, filter: FilterData) -> bool:
         for cat in self.categories:
             if cat.cid == category.cid:
                 for i, f in enumerate(cat.filters):
                     if f.fid == filter.fid:
                         cat.filters.pop(i)
+                        cat.invalidate_expression()
                         self._used_ids.discard(filter.fid)
                         return True
         return False
 
+    @profiler.timed()
     def rename_filter(self, category: CategoryData, filter: FilterData, new_name: str) -> bool:
         for cat in self.categories:
             if cat.cid == category.cid:
@@ -173,15 +527,63 @@ class DataBase:
                         return True
         return False
 
+    @profiler.timed()
+    def set_filter_content(self, category: CategoryData, filter: FilterData, content: str) -> bool:
+        for cat in self.categories:
+            if cat.cid == category.cid:
+                for f in cat.filters:
+                    if f.fid == filter.fid:
+                        f.content = content
+                        cat.invalidate_expression()
+                        return True
+        return False
+
     def get_categories(self) -> List[CategoryData]:
         return self.categories
 
+    @profiler.timed()
     def get_filters(self, category: CategoryData) -> List[FilterData]:
         for cat in self.categories:
             if cat.cid == category.cid:
                 return cat.filters
         return []
 
+    @profiler.timed()
+    def get_combined_expression(self, category: CategoryData, mode: str = "or", fids: Iterable[str] = None) -> str:
+        for cat in self.categories:
+            if cat.cid == category.cid:
+                return cat.combined_expression(mode, fids)
+        raise ValueError(f"类别不存在: {category.cid}")
+
+    @profiler.timed()
+    def search_categories(self, prefix: str) -> List[CategoryData]:
+        # 按名称前缀(不区分大小写)查找类别, 结果保持类别原有顺序
+        if not prefix:
+            return list(self.categories)
+        if self._positions is None:
+            self._positions = {cat.cid: i for i, cat in enumerate(self.categories)}
+        key = prefix.casefold()
+        positions = []
+        i = bisect.bisect_left(self._name_index, (key,))
+        while i < len(self._name_index) and self._name_index[i][0].startswith(key):
+            positions.append(self._positions[self._name_index[i][1]])
+            i += 1
+        positions.sort()
+        return [self.categories[i] for i in positions]
+
+    def _rebuild_name_index(self):
+        self._name_index = sorted((cat.name.casefold(), cat.cid) for cat in self.categories)
+        self._positions = None
+
+    def _index_add(self, category: CategoryData):
+        bisect.insort(self._name_index, (category.name.casefold(), category.cid))
+
+    def _index_remove(self, category: CategoryData):
+        entry = (category.name.casefold(), category.cid)
+        i = bisect.bisect_left(self._name_index, entry)
+        if i < len(self._name_index) and self._name_index[i] == entry:
+            self._name_index.pop(i)
+
     def print_tree(self):
         for cat in self.categories:
             print(f"类别: {cat.name}")
@@ -207,6 +609,9 @@ class DataBase:
 # =========================== UI类 =========================== #
 
 class LeftList:
+    # 选中项稳定多久(毫秒)后才通知回调, 避免连续切换时反复重建右侧列表
+    SELECT_DEBOUNCE_MS = 150
+
     def __init__(self, root_frame: Frame, pos_x: int, pos_y: int, width: int, height: int, db: DataBase):
         self.root_frame = root_frame
         self.pos_x = pos_x
@@ -215,26 +620,68 @@ class LeftList:
         self.height = height
         self.db = db
         self.custom_font = tkFont.Font(family="微软雅黑", size=10)
+
+        # 类别过滤输入框
+        filter_entry_height = 22
+        self.var_filter = StringVar()
+        self.var_filter.trace_add("write", lambda name, index, mode: self.apply_filter())
+        self.filter_entry = Entry(self.root_frame, font=self.custom_font, textvariable=self.var_filter)
+        self.filter_entry.place(x=self.pos_x, y=self.pos_y, width=self.width, height=filter_entry_height)
+
+        list_y = self.pos_y + filter_entry_height + 4
         self.lb = Listbox(self.root_frame, font=self.custom_font)
-        self.lb.configure(selectmode=SINGLE)
-        self.lb.place(x=self.pos_x, y=self.pos_y, width=self.width, height=self.height)
+        self.lb.configure(selectmode=SINGLE, exportselection=False)
+        self.lb.place(x=self.pos_x, y=list_y, width=self.width, height=self.height - (list_y - self.pos_y))
+        # 当前可见的类别, 与listbox中的行一一对应
         self.categories: List[CategoryData] = []
         self.select_event_callback = None
+        self._select_after_id = None
 
         self.lb.bind("<<ListboxSelect>>", self.__on_select_event)
         self.lb.bind("<Button-3>", self.__on_right_click)
 
         self.load_data()
 
+    @profiler.timed()
     def load_data(self):
-        self.categories = []
-        for cat in self.db.get_categories():
-            self.categories.append(cat)
-            self.lb.insert(END, cat.name)
+        self.categories = self.db.search_categories(self.var_filter.get())
+        self.lb.delete(0, END)
+        if self.categories:
+            self.lb.insert(END, *[cat.name for cat in self.categories])
+
+    # 按过滤框内容重新加载可见类别, 保留当前选中项(若仍可见)
+    @profiler.timed()
+    def apply_filter(self):
+        selected = self.get_selected_category()
+        self.load_data()
+        if selected in self.categories:
+            index = self.categories.index(selected)
+            self.lb.select_set(index)
+            self.lb.see(index)
+
+    def get_selected_category(self):
+        if len(self.lb.curselection()) == 0:
+            return None
+        return self.categories[self.lb.curselection()[0]]
+
+    # 新类别不满足当前过滤条件时, 清空过滤框后再选中它
+    def __select_category(self, cat: CategoryData):
+        self.var_filter.set("")
+        index = self.categories.index(cat)
+        self.lb.selection_clear(0, END)
+        self.lb.select_set(index)
+        self.lb.see(index)
+        self.lb.event_generate("<<ListboxSelect>>")
+
+    def __match_filter(self, cat: CategoryData) -> bool:
+        return cat.name.casefold().startswith(self.var_filter.get().casefold())
 
     # 在最后位置前插入一个类别，并将焦点移到该位置
     def append_category(self, name: str):
         cat = self.db.add_category(name)
+        if not self.__match_filter(cat):
+            self.__select_category(cat)
+            return
         self.categories.append(cat)
         self.lb.selection_clear(0, END)
         self.lb.insert(END, name)
@@ -246,6 +693,9 @@ class LeftList:
         if index < 0 or index > len(self.categories):
             return
         cat = self.db.insert_category(name, self.categories[index])
+        if not self.__match_filter(cat):
+            self.__select_category(cat)
+            return
         self.categories.insert(index, cat)
         self.lb.selection_clear(0, END)
         self.lb.insert(index, name)
@@ -271,7 +721,11 @@ class LeftList:
         if not new_name:
             showwarning("警告", "名称不能为空")
             return
-        self.categories[index].name = new_name
+        self.db.rename_category(self.categories[index], new_name)
+        if not self.__match_filter(self.categories[index]):
+            # 新名称不再满足过滤条件, 从可见列表中移除
+            self.apply_filter()
+            return
         self.lb.delete(index)
         self.lb.insert(index, new_name)
         self.lb.select_set(index)
@@ -279,11 +733,21 @@ class LeftList:
     def __on_select_event(self, event):
         if len(self.lb.curselection()) == 0:
             return
-        index = self.lb.curselection()[0]
+        # 选中项连续变化时只在最后一次变化后通知回调
+        if self._select_after_id is not None:
+            self.lb.after_cancel(self._select_after_id)
+        self._select_after_id = self.lb.after(self.SELECT_DEBOUNCE_MS, self.__on_select_settled)
+
+    @profiler.timed()
+    def __on_select_settled(self):
+        self._select_after_id = None
+        category = self.get_selected_category()
+        if category is None:
+            return
         if self.select_event_callback is not None:
             # 判断是否是函数
             if callable(self.select_event_callback):
-                self.select_event_callback(self.categories[index])
+                self.select_event_callback(category)
 
     # 注册ListboxSelect事件处理回调函数
     def register_select_event_callback(self, func):
@@ -306,6 +770,12 @@ class LeftList:
             if new_name is not None:
                 self.insert_category(new_name, c_index)
 
+        def menu_copy_expression(c_index: int, mode: str):
+            expr = self.db.get_combined_expression(self.categories[c_index], mode)
+            self.root_frame.clipboard_clear()
+            self.root_frame.clipboard_append(expr)
+            print("已复制组合表达式")
+
         def menu_remove_category(c_index: int):
             if askyesno("删除类别", f"是否删除类别: {self.categories[c_index].name}"):
                 self.remove_category(c_index)
@@ -337,18 +807,23 @@ class LeftList:
                 menu.add_command(label="插入新类别", command=lambda: memu_insert_category(item_index))
                 menu.add_command(label="添加类别", command=lambda: menu_add_category())
                 menu.add_command(label="删除类别", command=lambda: menu_remove_category(item_index))
+                menu.add_separator()
+                menu.add_command(label="复制全部过滤器(||)", command=lambda: menu_copy_expression(item_index, "or"))
+                menu.add_command(label="复制全部过滤器(&&)", command=lambda: menu_copy_expression(item_index, "and"))
                 menu.post(event.x_root, event.y_root)
 
 
 class RightList:
     class RightItem:
         def __init__(self, root_frame: Frame, width: int, height: int, filter_data: FilterData,
-                     category_data: CategoryData, right_click_callback, delete_callback, or_and_callback):
+                     category_data: CategoryData, db: DataBase, right_click_callback, delete_callback,
+                     or_and_callback):
             self.root_frame = root_frame
             self.width = width
             self.height = height
             self.filter: FilterData = filter_data
             self.category: CategoryData = category_data
+            self.db = db
             self.custom_font = tkFont.Font(family="微软雅黑", size=10)
             self.frame = Frame(root_frame, bg="#F0FFFF", relief="raised", bd=1, width=self.width, height=self.height)
             # self.frame.pack(padx=0, pady=0, fill="x")
@@ -416,10 +891,12 @@ class RightList:
         def destroy_item(self):
             self.frame.destroy()
 
+        @profiler.timed()
         def __on_copy(self):
             self.root_frame.clipboard_clear()
             self.root_frame.clipboard_append(self.filter.content)
 
+        @profiler.timed()
         def __on_or_and(self, mode: str):
             if mode == "or" or mode == "and":
                 if self.or_and_callback is not None:
@@ -429,6 +906,7 @@ class RightList:
             else:
                 raise ValueError(f"不支持的操作: {mode}")
 
+        @profiler.timed()
         def __on_delete(self):
             if askyesno("删除filter", f"是否删除filter: >{self.filter.name}<？"):
                 if self.delete_callback is not None:
@@ -436,12 +914,15 @@ class RightList:
                     if callable(self.delete_callback):
                         self.delete_callback(self)
 
+        @profiler.timed()
         def __on_name_change(self):
-            self.filter.name = self.var_name.get()
+            self.db.rename_filter(self.category, self.filter, self.var_name.get())
 
+        @profiler.timed()
         def __on_content_change(self):
-            self.filter.content = self.var_content.get()
+            self.db.set_filter_content(self.category, self.filter, self.var_content.get())
 
+        @profiler.timed()
         def __on_frame_right_click(self, event):
             if self.right_click_callback is not None:
                 # 判断是否是函数
@@ -497,6 +978,7 @@ class RightList:
         step = 2 * direction
         self.canvas.yview_scroll(step, "units")
 
+    @profiler.timed()
     def set_category(self, category: CategoryData):
         self.clear_category()
         self.category = category
@@ -507,7 +989,7 @@ class RightList:
 
         for item in self.category.filters:
             item_obj = RightList.RightItem(self.scroll_frame, self.item_width, self.item_height, item, self.category,
-                                           self.__on_item_frame_right_click,
+                                           self.db, self.__on_item_frame_right_click,
                                            self.__on_delete_callback,
                                            self.__on_or_and_callback)
             item_obj.frame.pack(padx=0, pady=0, fill="x")
@@ -529,6 +1011,7 @@ class RightList:
             self.vsb.set(0, 1)  # 固定滚动条位置
             self.canvas.configure(yscrollcommand=None)
 
+    @profiler.timed()
     def update_scroll(self):
         total_height = len(self.category.filters) * self.item_height
         self.scroll_frame.configure(height=total_height)
@@ -548,11 +1031,12 @@ class RightList:
             self.vsb.set(0, 1)  # 固定滚动条位置
             self.canvas.configure(yscrollcommand=None)
 
+    @profiler.timed()
     def update_ui_add_filter(self):
         filter = self.db.add_filter(self.category, "", "")
 
         item_obj = RightList.RightItem(self.scroll_frame, self.item_width, self.item_height, filter, self.category,
-                                       self.__on_item_frame_right_click,
+                                       self.db, self.__on_item_frame_right_click,
                                        self.__on_delete_callback,
                                        self.__on_or_and_callback)
         item_obj.frame.pack(padx=0, pady=0, fill="x")
@@ -560,6 +1044,7 @@ class RightList:
 
         self.update_scroll()
 
+    @profiler.timed()
     def update_ui_insert_filter(self, next_filter: FilterData):
         filter = self.db.insert_filter(self.category, "", next_filter)
         index = self.category.filters.index(next_filter)
@@ -571,7 +1056,7 @@ class RightList:
                 break
 
         item_obj = RightList.RightItem(self.scroll_frame, self.item_width, self.item_height, filter, self.category,
-                                       self.__on_item_frame_right_click,
+                                       self.db, self.__on_item_frame_right_click,
                                        self.__on_delete_callback,
                                        self.__on_or_and_callback)
         self.item_table.insert(index, item_obj)
@@ -608,15 +1093,63 @@ class RightList:
         menu.add_command(label="向上插入过滤器", command=lambda: menu_insert_filter())
         menu.post(event.x_root, event.y_root)
 
+    @profiler.timed()
     def __on_delete_callback(self, right_item: RightItem):
         self.db.remove_filter(self.category, right_item.filter)
         right_item.frame.destroy()
         self.update_scroll()
 
+    @profiler.timed()
     def __on_or_and_callback(self, mode: str, filter: FilterData):
         self.or_and_callback(mode, filter.content)
 
 
+class StatsWindow(Toplevel):
+    def __init__(self, master, prof: Profiler):
+        super().__init__(master)
+        self.profiler = prof
+        self.custom_font = tkFont.Font(family="Consolas", size=9)
+        self.title("性能统计")
+        self.geometry("640x360")
+
+        self.var_enabled = BooleanVar(value=self.profiler.enabled)
+        enable_btn = Checkbutton(self, text="启用统计", variable=self.var_enabled, command=self.__on_toggle)
+        enable_btn.place(x=6, y=6, width=90, height=24)
+        refresh_btn = Button(self, text="刷新", command=self.refresh)
+        refresh_btn.place(x=380, y=6, width=79, height=24)
+        reset_btn = Button(self, text="重置", command=self.__on_reset)
+        reset_btn.place(x=465, y=6, width=79, height=24)
+        dump_btn = Button(self, text="导出JSON", command=self.__on_dump)
+        dump_btn.place(x=550, y=6, width=84, height=24)
+
+        self.text = Text(self, font=self.custom_font, wrap=NONE)
+        self.text.place(x=6, y=36, width=628, height=318)
+
+        self.refresh()
+
+    def refresh(self):
+        header = f"{'名称':<44}{'次数':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}"
+        lines = [header]
+        for name, stat in self.profiler.summary().items():
+            lines.append(f"{name:<46}{stat['count']:>8}{stat['p50_ms']:>10.3f}"
+                         f"{stat['p95_ms']:>10.3f}{stat['max_ms']:>10.3f}")
+        self.text.delete("1.0", END)
+        self.text.insert("1.0", "\n".join(lines))
+
+    def __on_toggle(self):
+        self.profiler.enabled = self.var_enabled.get()
+
+    def __on_reset(self):
+        self.profiler.reset()
+        self.refresh()
+
+    def __on_dump(self):
+        json_path = asksaveasfilename(parent=self, defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if json_path:
+            self.profiler.dump_json(json_path)
+            print(f"已导出统计: {json_path}")
+
+
 class EToolUI(Tk):
     def __init__(self, json_path: str = None):
         super().__init__()
@@ -653,6 +1186,7 @@ class EToolUI(Tk):
         if askyesno("退出", "你确定要退出吗？退出前注意保存修改"):
             self.destroy()  # 真正关闭窗口
 
+    @profiler.timed()
     def save_config(self):
         print("保存配置")
         self.data_base.save_json()
@@ -660,6 +1194,7 @@ class EToolUI(Tk):
     def __init_menu(self):
         menubar = Menu(self, tearoff=False)
         menubar.add_command(label="📁保存", command=self.save_config)
+        menubar.add_command(label="📊统计", command=lambda: StatsWindow(self, profiler))
         self.config(menu=menubar)
         return menubar
 
@@ -701,11 +1236,13 @@ class EToolUI(Tk):
         return RightList(self, right_panel_pos_x, right_panel_pos_y, right_panel_width, right_panel_height,
                          self.data_base, self._or_and_callback)
 
+    @profiler.timed()
     def __left_list_select_event(self, category: CategoryData):
         # 切换分类
         self.current_category = category
         self.right_list.set_category(category)
 
+    @profiler.timed()
     def _or_and_callback(self, mode: str, content: str):
         if content.isspace():
             return  # 空白内容不处理
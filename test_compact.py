@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from main import DataBase, COMPACT_MAGIC
+
+
+DATA = [
+    ["cat00001", "HFP 通话", [
+        ["flt00001", "基础流程", 'frame contains "eSCO DL"||frame contains "eSCO UL"'],
+        ["flt00002", "空格", 'frame contains "A" || frame contains "B"  &&  frame contains "C"'],
+        ["flt00003", "换行", 'frame contains "A"\n||\nframe contains "B"&&'],
+        ["flt00004", "", ""],
+        ["flt00005", "空白", "   "],
+    ]],
+    ["cat00002", "", []],
+    ["cat00003", "降噪 ECNR", [
+        ["flt00006", "重复", 'frame contains "eSCO DL"||frame contains "eSCO UL"'],
+        ["flt00007", "运算符", "||&&||"],
+    ]],
+]
+
+
+@pytest.fixture
+def json_path(tmp_path):
+    path = tmp_path / "FilterHelper.json"
+    path.write_text(json.dumps(DATA, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def test_round_trip(json_path, tmp_path):
+    compact_path = str(tmp_path / "FilterHelper.fhpk")
+    db = DataBase(json_path)
+    assert not db.compact
+    db.save_json(compact_path, compact=True)
+
+    db = DataBase(compact_path)
+    assert db.compact
+    back_path = str(tmp_path / "back.json")
+    db.save_json(back_path, compact=False)
+
+    with open(json_path, encoding="utf-8") as f, open(back_path, encoding="utf-8") as g:
+        assert f.read() == g.read()
+
+
+def test_read_category(json_path, tmp_path):
+    compact_path = str(tmp_path / "FilterHelper.fhpk")
+    DataBase(json_path).save_json(compact_path, compact=True)
+
+    for path in (json_path, compact_path):
+        db = DataBase()
+        db.json_path = path
+        cat = db.read_category("cat00003")
+        assert [[f.fid, f.name, f.content] for f in cat.filters] == DATA[2][2]
+        assert db.read_category("missing") is None
+
+
+def test_corrupt_file(json_path, tmp_path):
+    compact_path = tmp_path / "FilterHelper.fhpk"
+    DataBase(json_path).save_json(str(compact_path), compact=True)
+    raw = compact_path.read_bytes()
+
+    broken = [
+        COMPACT_MAGIC + b"\x02",
+        raw[:20],
+        raw[:-10],
+        raw[:-10] + b"\x00" * 10,
+    ]
+    for content in broken:
+        compact_path.write_bytes(content)
+        with pytest.raises(ValueError, match="紧凑格式文件已损坏"):
+            DataBase(str(compact_path))